@@ -0,0 +1,9 @@
+from django.conf import settings
+
+# Test-only settings overrides, applied before any test database or user is created
+
+# PBKDF2 is deliberately slow; fixtures only need a password that can be checked
+settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Persistent connections buy nothing against the test database
+settings.DATABASES['default']['CONN_MAX_AGE'] = 0
@@ -4,6 +4,24 @@ from .models import Team, Project, Task, Comment
 
 # Register your models here.
 admin.site.register(Team)
-admin.site.register(Project)
-admin.site.register(Task)
-admin.site.register(Comment)
+
+
+@admin.register(Project)
+class ProjectAdmin(admin.ModelAdmin):
+    list_display = ('name', 'team', 'created_at')
+    list_select_related = ('team',)
+    list_per_page = 50
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('title', 'status', 'project', 'assignee')
+    list_select_related = ('project', 'assignee')
+    list_per_page = 50
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'created_at')
+    list_select_related = ('task',)
+    list_per_page = 50
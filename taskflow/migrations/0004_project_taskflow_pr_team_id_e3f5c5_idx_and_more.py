@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskflow', '0003_alter_comment_id_alter_project_id_alter_task_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['team', 'id'], name='taskflow_pr_team_id_e3f5c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'id'], name='taskflow_ta_project_44b76a_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-15 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taskflow', '0004_project_taskflow_pr_team_id_e3f5c5_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at'], name='taskflow_co_task_id_83c73e_idx'),
+        ),
+        # The auto-created members table cannot declare Meta.indexes; this
+        # covers lookups from the user side of the membership
+        migrations.RunSQL(
+            sql='CREATE INDEX "taskflow_team_members_user_id_team_id_idx" ON "taskflow_team_members" ("user_id", "team_id");',
+            reverse_sql='DROP INDEX "taskflow_team_members_user_id_team_id_idx";',
+        ),
+    ]
@@ -1,6 +1,11 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+class TeamManager(models.Manager):
+    def user_is_member_of_task(self, user_id, task_id):
+        """Return whether the user belongs to the team owning the task, in one query."""
+        return Task.objects.filter(id=task_id, project__team__members__id=user_id).exists()
+
 # Create your models here.
 class Team(models.Model):
     name = models.CharField(max_length=200)
@@ -9,6 +14,8 @@ class Team(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TeamManager()
+
 class Project(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField()
@@ -16,6 +23,11 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['team', 'id']),
+        ]
+
 class Task(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -25,9 +37,19 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'id']),
+        ]
+
 class Comment(models.Model):
     task = models.ForeignKey(Task, related_name='comments', on_delete=models.CASCADE)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'created_at']),
+        ]
+
@@ -0,0 +1,7 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key, newest rows first."""
+    page_size = 50
+    ordering = '-id'
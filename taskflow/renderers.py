@@ -0,0 +1,29 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer that encodes with orjson instead of the stdlib json module.
+
+    Types orjson does not know natively (lazy strings, Decimal, ...) fall
+    back to DRF's JSONEncoder. A requested indent (the `; indent=N` media
+    type parameter, or the browsable API's renderer context) pretty-prints
+    the output, always with orjson's two-space indent.
+
+    Like JSONRenderer, U+2028 and U+2029 are escaped so the output can be
+    embedded in JavaScript. Unlike it, NaN and Infinity are written as null
+    rather than rejected.
+    """
+
+    _default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self._default, option=option)
+        # Same escaping as JSONRenderer; these are valid JSON but not valid JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
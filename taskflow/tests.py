@@ -1,4 +1,6 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User, Group
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -10,39 +12,39 @@ from .models import Team, Project, Task, Comment
 class TaskFlowModelsTest(TestCase):
     """Basic model tests"""
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.team = Team.objects.create(
+        cls.team = Team.objects.create(
             name='Test Team',
             description='A test team'
         )
-        self.project = Project.objects.create(
+        cls.project = Project.objects.create(
             name='Test Project',
             description='A test project',
-            team=self.team
+            team=cls.team
         )
-        self.task = Task.objects.create(
+        cls.task = Task.objects.create(
             title='Test Task',
             description='A test task',
-            project=self.project,
+            project=cls.project,
             status='pending',
-            assignee=self.user
+            assignee=cls.user
         )
     
     @pytest.mark.slow
     def test_team_creation(self):
         """Test team creation"""
         self.assertEqual(self.team.name, 'Test Team')
-        self.assertIsNotNone(self.team.created_at)
     
     def test_project_team_relationship(self):
         """Test project belongs to team"""
         self.assertEqual(self.project.team, self.team)
-        self.assertIn(self.project, self.team.projects.all())
+        self.assertTrue(self.team.projects.filter(pk=self.project.pk).exists())
     
     def test_task_project_relationship(self):
         """Test task belongs to project"""
@@ -52,20 +54,18 @@ class TaskFlowModelsTest(TestCase):
     def test_team_members_relationship(self):
         """Test team members relationship"""
         self.team.members.add(self.user)
-        self.assertIn(self.user, self.team.members.all())
-        self.assertIn(self.team, self.user.teams.all())
+        self.assertTrue(self.team.members.filter(pk=self.user.pk).exists())
+        self.assertTrue(self.user.teams.filter(pk=self.team.pk).exists())
     
     def test_project_cascade_delete(self):
         """Test that deleting a team cascades to projects"""
-        project_count = Project.objects.count()
         self.team.delete()
-        self.assertEqual(Project.objects.count(), project_count - 1)
+        self.assertFalse(Project.objects.filter(pk=self.project.pk).exists())
     
     def test_task_cascade_delete(self):
         """Test that deleting a project cascades to tasks"""
-        task_count = Task.objects.count()
         self.project.delete()
-        self.assertEqual(Task.objects.count(), task_count - 1)
+        self.assertFalse(Task.objects.filter(pk=self.task.pk).exists())
     
     def test_comment_task_relationship(self):
         """Test comment belongs to task"""
@@ -74,80 +74,99 @@ class TaskFlowModelsTest(TestCase):
             content='Test comment'
         )
         self.assertEqual(comment.task, self.task)
-        self.assertIn(comment, self.task.comments.all())
+        self.assertTrue(self.task.comments.filter(pk=comment.pk).exists())
     
     def test_comment_cascade_delete(self):
         """Test that deleting a task cascades to comments"""
-        Comment.objects.create(task=self.task, content='Test comment')
-        comment_count = Comment.objects.count()
+        comment = Comment.objects.create(task=self.task, content='Test comment')
         self.task.delete()
-        self.assertEqual(Comment.objects.count(), comment_count - 1)
+        self.assertFalse(Comment.objects.filter(pk=comment.pk).exists())
     
     def test_model_timestamps(self):
         """Test that created_at and updated_at are set correctly"""
-        self.assertIsNotNone(self.team.created_at)
-        self.assertIsNotNone(self.team.updated_at)
-        self.assertIsNotNone(self.project.created_at)
-        self.assertIsNotNone(self.project.updated_at)
-        self.assertIsNotNone(self.task.created_at)
-        self.assertIsNotNone(self.task.updated_at)
+        for obj in (self.team, self.project, self.task):
+            self.assertIsNotNone(obj.created_at)
+            self.assertIsNotNone(obj.updated_at)
 
 
 @pytest.mark.integration
 class TaskFlowAPITest(APITestCase):
     """Basic API tests"""
     
-    def setUp(self):
-        self.client = APIClient()
-        
+    # Transactional TestCase on the default database only; never TransactionTestCase
+    databases = {'default'}
+    
+    @classmethod
+    def setUpTestData(cls):
         # Create admin user
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='admin',
             email='admin@example.com',
             password='adminpass123'
         )
-        admin_group = Group.objects.create(name='admin')
-        team_admin_group = Group.objects.create(name='team-admin')
-        self.admin_user.groups.add(admin_group, team_admin_group)
+        # Create the role groups in one INSERT
+        names = ['admin', 'manager', 'team-admin']
+        Group.objects.bulk_create([Group(name=name) for name in names], ignore_conflicts=True)
+        groups = Group.objects.in_bulk(names, field_name='name')
+        cls.admin_user.groups.add(groups['admin'], groups['team-admin'])
         
         # Create regular user
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='user',
             email='user@example.com',
             password='userpass123'
         )
 
         # Create a manager 
-        self.manager_user = User.objects.create_user(
+        cls.manager_user = User.objects.create_user(
             username='user-manager',
             email='user-manager@example.com',
             password='user-managerpass123',
         )
-        self.manager_user.groups.add(Group.objects.create(name='manager'))
-        
+        cls.manager_user.groups.add(groups['manager'])
+
+        # Create a user outside the team
+        cls.non_member = User.objects.create_user(
+            username='nonmember',
+            email='non@example.com',
+            password='pass123'
+        )
+
         # Create team
-        self.team = Team.objects.create(
+        cls.team = Team.objects.create(
             name='Test Team',
             description='A test team'
         )
-        self.team.members.add(self.user, self.manager_user)
+        cls.team.members.add(cls.user, cls.manager_user)
         
         # Create project
-        self.project = Project.objects.create(
+        cls.project = Project.objects.create(
             name='Test Project',
             description='A test project',
-            team=self.team
+            team=cls.team
         )
         
         # Create task
-        self.task = Task.objects.create(
+        cls.task = Task.objects.create(
             title='Test Task',
             description='A test task',
-            project=self.project,
+            project=cls.project,
             status='pending',
-            assignee=self.user
+            assignee=cls.user
         )
     
+    def setUp(self):
+        # Per-role clients are cheap to build; made in setUpTestData they
+        # would be deep-copied for every test instead
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(user=self.admin_user)
+        self.manager_client = APIClient()
+        self.manager_client.force_authenticate(user=self.manager_user)
+        self.user_client = APIClient()
+        self.user_client.force_authenticate(user=self.user)
+        self.non_member_client = APIClient()
+        self.non_member_client.force_authenticate(user=self.non_member)
+    
     def test_index_endpoint(self):
         """Test welcome endpoint"""
         response = self.client.get('')
@@ -158,37 +177,57 @@ class TaskFlowAPITest(APITestCase):
     @pytest.mark.slow
     def test_create_team_success(self):
         """Test team creation by admin"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {'name': 'New Team', 'description': 'New team'}
-        response = self.client.post('/api/teams/create/', data, format='json')
+        response = self.admin_client.post('/api/teams/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Team')
     
     
     def test_create_team_manager_success(self):
         """Test team creation by manager"""
-        self.client.force_authenticate(user=self.manager_user)
         data = {'name': 'Manager Team', 'description': 'Team created by manager'}
-        response = self.client.post('/api/teams/create/', data, format='json')
+        response = self.manager_client.post('/api/teams/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'Manager Team')
     
     def test_create_team_missing_name(self):
         """Test team creation fails without name"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {'description': 'Team without name'}
-        response = self.client.post('/api/teams/create/', data, format='json')
+        response = self.admin_client.post('/api/teams/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     def test_list_teams_authenticated(self):
         """Test listing teams for authenticated users"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/teams/')
+        # ETag: one team and one membership aggregate; list: one annotated query
+        with self.assertNumQueries(3):
+            response = self.user_client.get('/api/teams/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['name'], 'Test Team')
         self.assertIn('member_count', response.data[0])
     
+    def test_list_teams_etag_changes_with_membership(self):
+        """Test team list ETag changes when members are added"""
+        response = self.user_client.get('/api/teams/')
+        etag = response['ETag']
+        self.team.members.add(self.admin_user)
+        response = self.user_client.get('/api/teams/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['member_count'], 3)
+
+    def test_list_teams_not_modified(self):
+        """Test unchanged team list returns 304 for a matching ETag"""
+        response = self.user_client.get('/api/teams/')
+        self.assertIn('ETag', response)
+        response = self.user_client.get('/api/teams/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_teams_etag_depends_on_media_type(self):
+        """Test an ETag from the browsable API does not match a JSON request"""
+        etag = self.user_client.get('/api/teams/', HTTP_ACCEPT='text/html')['ETag']
+        response = self.user_client.get('/api/teams/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_list_teams_unauthenticated(self):
         """Test listing teams fails for unauthenticated users"""
         response = self.client.get('/api/teams/')
@@ -197,59 +236,51 @@ class TaskFlowAPITest(APITestCase):
     # Project tests
     def test_create_project_success(self):
         """Test project creation by team member"""
-        self.client.force_authenticate(user=self.manager_user)
         data = {
             'name': 'New Project',
             'description': 'A new project',
             'team_id': self.team.id
         }
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.manager_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['name'], 'New Project')
         self.assertEqual(response.data['team_id'], self.team.id)
     
     def test_create_project_unauthorized(self):
         """Test project creation by non-team member"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
         data = {
             'name': 'New Project',
             'description': 'A new project',
             'team_id': self.team.id
         }
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.non_member_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
     def test_create_project_missing_fields(self):
         """Test project creation fails without required fields"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {'name': 'Project without team'}
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.admin_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     def test_create_project_invalid_team(self):
         """Test project creation fails with invalid team ID"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {
             'name': 'New Project',
             'description': 'A new project',
             'team_id': 99999  # Non-existent team
         }
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.admin_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
     
     def test_list_projects_authenticated(self):
         """Test listing projects for authenticated team member"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/projects/')
+        # One joined page query; no ETag aggregate over every visible project
+        with self.assertNumQueries(1):
+            response = self.user_client.get('/api/projects/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], 'Test Project')
-        self.assertIn('team_name', response.data[0])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['name'], 'Test Project')
+        self.assertIn('team_name', response.data['results'][0])
     
     def test_list_projects_unauthenticated(self):
         """Test listing projects fails for unauthenticated users"""
@@ -258,39 +289,96 @@ class TaskFlowAPITest(APITestCase):
     
     def test_list_projects_non_member(self):
         """Test listing projects for non-team member returns empty"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
-        response = self.client.get('/api/projects/')
+        response = self.non_member_client.get('/api/projects/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
     
     # Task tests
-    
+    def test_create_task_with_assignee(self):
+        """Test task creation with a team member as assignee"""
+        data = {
+            'title': 'Assigned Task',
+            'description': 'Task with an assignee',
+            'project_id': self.project.id,
+            'assignee_id': self.user.id
+        }
+        response = self.manager_client.post('/api/tasks/create/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['assignee_id'], self.user.id)
+        self.assertEqual(response.data['assignee_username'], 'user')
+
+    def test_create_task_assignee_not_member(self):
+        """Test task creation fails when assignee is not a team member"""
+        data = {
+            'title': 'Assigned Task',
+            'description': 'Task with an assignee',
+            'project_id': self.project.id,
+            'assignee_id': self.admin_user.id
+        }
+        response = self.manager_client.post('/api/tasks/create/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_task_invalid_assignee_id(self):
+        """Test task creation rejects a non-integer assignee ID"""
+        data = {
+            'title': 'Assigned Task',
+            'description': 'Task with an assignee',
+            'project_id': self.project.id,
+            'assignee_id': 'abc'
+        }
+        response = self.manager_client.post('/api/tasks/create/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_task_invalid_project(self):
         """Test task creation fails with invalid project ID"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {
             'title': 'New Task',
             'description': 'A new task',
             'project_id': 99999  # Non-existent project
         }
-        response = self.client.post('/api/tasks/create/', data, format='json')
+        response = self.admin_client.post('/api/tasks/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
     
     def test_list_tasks_authenticated(self):
         """Test listing tasks for authenticated team member"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/tasks/')
+        # One joined page query; no ETag aggregate over every visible task
+        with self.assertNumQueries(1):
+            response = self.user_client.get('/api/tasks/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Task')
-        self.assertIn('project_name', response.data[0])
-        self.assertIn('assignee_username', response.data[0])
-    
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Task')
+        self.assertIn('project_name', response.data['results'][0])
+        self.assertIn('assignee_username', response.data['results'][0])
+    
+    def test_list_tasks_paginated(self):
+        """Test task list is paginated newest first"""
+        Task.objects.bulk_create([
+            Task(title=f'Task {i}', description='', project=self.project,
+                 status='pending', assignee=self.user)
+            for i in range(50)
+        ])
+        response = self.user_client.get('/api/tasks/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 50)
+        self.assertEqual(response.data['results'][0]['title'], 'Task 49')
+        self.assertIsNotNone(response.data['next'])
+        response = self.user_client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Task')
+
+    def test_list_tasks_renders_json(self):
+        """Test list response body is rendered as JSON"""
+        response = self.user_client.get('/api/tasks/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = response.json()
+        self.assertEqual(body['results'][0]['title'], 'Test Task')
+        self.assertTrue(body['results'][0]['created_at'].endswith('Z'))
+
+    def test_list_tasks_renders_indented_json(self):
+        """Test an indent media type parameter pretty-prints the JSON"""
+        response = self.user_client.get('/api/tasks/', HTTP_ACCEPT='application/json; indent=4')
+        self.assertIn(b'\n  "', response.content)
+
     def test_list_tasks_unauthenticated(self):
         """Test listing tasks fails for unauthenticated users"""
         response = self.client.get('/api/tasks/')
@@ -298,59 +386,57 @@ class TaskFlowAPITest(APITestCase):
     
     def test_list_tasks_non_member(self):
         """Test listing tasks for non-team member returns empty"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
-        response = self.client.get('/api/tasks/')
+        response = self.non_member_client.get('/api/tasks/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data['results']), 0)
     
     # Comment tests
     def test_create_comment_success(self):
         """Test comment creation by team member"""
-        self.client.force_authenticate(user=self.user)
         data = {
             'content': 'Test comment content',
             'task_id': self.task.id
         }
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.user_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['content'], 'Test comment content')
         self.assertEqual(response.data['task_id'], self.task.id)
     
+    def test_create_comment_form_task_id(self):
+        """Test a form-encoded task ID is returned as an integer"""
+        data = {'content': 'Test comment content', 'task_id': str(self.task.id)}
+        response = self.user_client.post('/api/comments/create/', data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['task_id'], self.task.id)
+
+    def test_create_comment_invalid_task_id(self):
+        """Test comment creation rejects a non-integer task ID"""
+        data = {'content': 'Test comment content', 'task_id': 'abc'}
+        response = self.user_client.post('/api/comments/create/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_create_comment_unauthorized(self):
         """Test comment creation by non-team member"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
         data = {
             'content': 'Test comment content',
             'task_id': self.task.id
         }
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.non_member_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
     def test_create_comment_missing_fields(self):
         """Test comment creation fails without required fields"""
-        self.client.force_authenticate(user=self.user)
         data = {'task_id': self.task.id}
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.user_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
     def test_create_comment_invalid_task(self):
         """Test comment creation fails with invalid task ID"""
-        self.client.force_authenticate(user=self.user)
         data = {
             'content': 'Test comment content',
             'task_id': 99999  # Non-existent task
         }
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.user_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
     
     def test_list_comments_success(self):
@@ -361,33 +447,81 @@ class TaskFlowAPITest(APITestCase):
             content='Test comment'
         )
         
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get(f'/api/tasks/{self.task.id}/comments/')
+        # ETag query, which also confirms membership, then the comment query
+        with self.assertNumQueries(2):
+            response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['content'], 'Test comment')
     
     def test_list_comments_unauthorized(self):
         """Test listing comments fails for non-team member"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
-        response = self.client.get(f'/api/tasks/{self.task.id}/comments/')
+        response = self.non_member_client.get(f'/api/tasks/{self.task.id}/comments/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
+    def test_list_comments_oldest_first(self):
+        """Test comments are listed in the order they were written"""
+        newer = Comment.objects.create(task=self.task, content='Newer comment')
+        older = Comment.objects.create(task=self.task, content='Older comment')
+        Comment.objects.filter(pk=older.pk).update(created_at=newer.created_at - timedelta(minutes=1))
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertEqual([c['content'] for c in response.data], ['Older comment', 'Newer comment'])
+
+    def test_list_comments_same_timestamp_by_id(self):
+        """Test comments written at the same instant are listed in creation order"""
+        first = Comment.objects.create(task=self.task, content='First comment')
+        second = Comment.objects.create(task=self.task, content='Second comment')
+        Comment.objects.filter(pk=second.pk).update(created_at=first.created_at)
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertEqual([c['content'] for c in response.data], ['First comment', 'Second comment'])
+
+    def test_list_comments_etag_changes_after_update(self):
+        """Test comment list ETag changes when a comment is edited"""
+        comment = Comment.objects.create(task=self.task, content='Test comment')
+        etag = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')['ETag']
+        comment.content = 'Edited comment'
+        comment.save()
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['content'], 'Edited comment')
+
+    def test_list_comments_escapes_line_separators(self):
+        """Test U+2028 and U+2029 in comment text are escaped in the JSON"""
+        Comment.objects.create(task=self.task, content='a\u2028b\u2029c')
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertIn(b'a\\u2028b\\u2029c', response.content)
+        self.assertEqual(response.json()[0]['content'], 'a\u2028b\u2029c')
+
+    def test_list_comments_not_modified(self):
+        """Test unchanged comment list returns 304 for a matching ETag"""
+        Comment.objects.create(task=self.task, content='Test comment')
+        etag = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')['ETag']
+        # Only the ETag query runs; the comments are not fetched
+        with self.assertNumQueries(1):
+            response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_comments_etag_requires_membership(self):
+        """Test a member's ETag stops matching once they leave the team"""
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
+        etag = response['ETag']
+        response = self.non_member_client.get(f'/api/tasks/{self.task.id}/comments/')
+        self.assertNotIn('ETag', response)
+
+        self.team.members.remove(self.user)
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn('ETag', response)
+
     def test_list_comments_invalid_task(self):
         """Test listing comments fails for invalid task ID"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get('/api/tasks/99999/comments/')
+        response = self.user_client.get('/api/tasks/99999/comments/')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
     
     def test_list_comments_empty(self):
         """Test listing comments for task with no comments"""
-        self.client.force_authenticate(user=self.user)
-        response = self.client.get(f'/api/tasks/{self.task.id}/comments/')
+        response = self.user_client.get(f'/api/tasks/{self.task.id}/comments/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 0)
 
@@ -396,48 +530,52 @@ class TaskFlowAPITest(APITestCase):
 class TaskFlowEdgeCasesTest(TestCase):
     """Test edge cases and error conditions"""
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.team = Team.objects.create(
+        cls.team = Team.objects.create(
             name='Test Team',
             description='A test team'
         )
-        self.project = Project.objects.create(
+        cls.project = Project.objects.create(
             name='Test Project',
             description='A test project',
-            team=self.team
+            team=cls.team
         )
     
     def test_team_name_max_length(self):
         """Test team name respects max length"""
         long_name = 'A' * 200  # Max length
-        team = Team.objects.create(name=long_name, description='Test')
+        team = Team(name=long_name, description='Test')
+        team.full_clean()
         self.assertEqual(team.name, long_name)
     
     def test_project_name_max_length(self):
         """Test project name respects max length"""
         long_name = 'A' * 200  # Max length
-        project = Project.objects.create(
+        project = Project(
             name=long_name,
             description='Test',
             team=self.team
         )
+        project.full_clean()
         self.assertEqual(project.name, long_name)
     
     def test_task_title_max_length(self):
         """Test task title respects max length"""
         long_title = 'A' * 200  # Max length
-        task = Task.objects.create(
+        task = Task(
             title=long_title,
             description='Test',
             project=self.project,
             status='pending',
             assignee=self.user
         )
+        task.full_clean()
         self.assertEqual(task.title, long_title)
     
     def test_comment_content_blank(self):
@@ -465,159 +603,153 @@ class TaskFlowEdgeCasesTest(TestCase):
 class TaskFlowPermissionTest(APITestCase):
     """Test permission-based access control"""
     
-    def setUp(self):
-        self.client = APIClient()
-        
-        # Create users with different permission levels
-        self.admin_user = User.objects.create_user(
-            username='admin',
-            email='admin@example.com',
-            password='adminpass123'
-        )
-        admin_group = Group.objects.create(name='admin')
-        self.admin_user.groups.add(admin_group)
-        
-        self.manager_user = User.objects.create_user(
-            username='manager',
-            email='manager@example.com',
-            password='managerpass123'
-        )
-        manager_group = Group.objects.create(name='manager')
-        self.manager_user.groups.add(manager_group)
-        
-        self.regular_user = User.objects.create_user(
-            username='regular',
-            email='regular@example.com',
-            password='regularpass123'
-        )
-        
+    # Transactional TestCase on the default database only; never TransactionTestCase
+    databases = {'default'}
+    
+    @classmethod
+    def setUpTestData(cls):
+        # Create users with different permission levels in one INSERT each
+        cls.admin_user, cls.manager_user, cls.regular_user, cls.non_member = User.objects.bulk_create([
+            User(username='admin', email='admin@example.com', password=make_password('adminpass123')),
+            User(username='manager', email='manager@example.com', password=make_password('managerpass123')),
+            User(username='regular', email='regular@example.com', password=make_password('regularpass123')),
+            User(username='nonmember', email='non@example.com', password=make_password('pass123')),
+        ])
+        # Create the role groups in one INSERT
+        names = ['admin', 'manager']
+        Group.objects.bulk_create([Group(name=name) for name in names], ignore_conflicts=True)
+        groups = Group.objects.in_bulk(names, field_name='name')
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user=cls.admin_user, group=groups['admin']),
+            User.groups.through(user=cls.manager_user, group=groups['manager']),
+        ])
+
         # Create team and add users
-        self.team = Team.objects.create(
+        cls.team = Team.objects.create(
             name='Test Team',
             description='A test team'
         )
-        self.team.members.add(self.regular_user, self.manager_user)
+        Team.members.through.objects.bulk_create([
+            Team.members.through(team=cls.team, user=cls.regular_user),
+            Team.members.through(team=cls.team, user=cls.manager_user),
+        ])
         
         # Create project
-        self.project = Project.objects.create(
+        cls.project = Project.objects.create(
             name='Test Project',
             description='A test project',
-            team=self.team
+            team=cls.team
         )
         
         # Create task
-        self.task = Task.objects.create(
+        cls.task = Task.objects.create(
             title='Test Task',
             description='A test task',
-            project=self.project,
+            project=cls.project,
             status='pending',
-            assignee=self.regular_user
+            assignee=cls.regular_user
         )
     
+    def setUp(self):
+        # Per-role clients are cheap to build; made in setUpTestData they
+        # would be deep-copied for every test instead
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(user=self.admin_user)
+        self.manager_client = APIClient()
+        self.manager_client.force_authenticate(user=self.manager_user)
+        self.regular_client = APIClient()
+        self.regular_client.force_authenticate(user=self.regular_user)
+        self.non_member_client = APIClient()
+        self.non_member_client.force_authenticate(user=self.non_member)
+    
     def test_admin_can_create_team(self):
         """Test admin can create teams"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {'name': 'Admin Team', 'description': 'Team by admin'}
-        response = self.client.post('/api/teams/create/', data, format='json')
+        response = self.admin_client.post('/api/teams/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_manager_can_create_team(self):
         """Test manager can create teams"""
-        self.client.force_authenticate(user=self.manager_user)
         data = {'name': 'Manager Team', 'description': 'Team by manager'}
-        response = self.client.post('/api/teams/create/', data, format='json')
+        response = self.manager_client.post('/api/teams/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_admin_can_create_project(self):
         """Test admin can create projects"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {
             'name': 'Admin Project',
             'description': 'Project by admin',
             'team_id': self.team.id
         }
         self.team.members.add(self.admin_user)
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.admin_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_manager_can_create_project(self):
         """Test manager can create projects"""
-        self.client.force_authenticate(user=self.manager_user)
         data = {
             'name': 'Manager Project',
             'description': 'Project by manager',
             'team_id': self.team.id
         }
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.manager_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_regular_user_cannot_create_project(self):
         """Test regular user cannot create projects"""
-        self.client.force_authenticate(user=self.regular_user)
         data = {
             'name': 'Regular Project',
             'description': 'Project by regular user',
             'team_id': self.team.id
         }
-        print(f'{self.regular_user.groups}')
-        response = self.client.post('/api/projects/create/', data, format='json')
+        response = self.regular_client.post('/api/projects/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
     def test_admin_can_create_task(self):
         """Test admin can create tasks"""
-        self.client.force_authenticate(user=self.admin_user)
         data = {
             'title': 'Admin Task',
             'description': 'Task by admin',
             'project_id': self.project.id
         }
         self.team.members.add(self.admin_user)
-        response = self.client.post('/api/tasks/create/', data, format='json')
+        response = self.admin_client.post('/api/tasks/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_manager_can_create_task(self):
         """Test manager can create tasks"""
-        self.client.force_authenticate(user=self.manager_user)
         data = {
             'title': 'Manager Task',
             'description': 'Task by manager',
             'project_id': self.project.id
         }
-        response = self.client.post('/api/tasks/create/', data, format='json')
+        response = self.manager_client.post('/api/tasks/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_regular_user_cannot_create_task(self):
         """Test regular user cannot create tasks"""
-        self.client.force_authenticate(user=self.regular_user)
         data = {
             'title': 'Regular Task',
             'description': 'Task by regular user',
             'project_id': self.project.id
         }
-        response = self.client.post('/api/tasks/create/', data, format='json')
+        response = self.regular_client.post('/api/tasks/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
     
     def test_team_member_can_create_comment(self):
         """Test team member can create comments"""
-        self.client.force_authenticate(user=self.regular_user)
         data = {
             'content': 'Comment by team member',
             'task_id': self.task.id
         }
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.regular_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
     
     def test_non_team_member_cannot_create_comment(self):
         """Test non-team member cannot create comments"""
-        non_member = User.objects.create_user(
-            username='nonmember',
-            email='non@example.com',
-            password='pass123'
-        )
-        self.client.force_authenticate(user=non_member)
         data = {
             'content': 'Comment by non-member',
             'task_id': self.task.id
         }
-        response = self.client.post('/api/comments/create/', data, format='json')
+        response = self.non_member_client.post('/api/comments/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
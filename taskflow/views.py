@@ -1,6 +1,12 @@
+import hashlib
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.models import User
+from django.db.models import Count, F, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import condition
 from .models import Team, Project, Task, Comment
+from .pagination import NewestFirstCursorPagination
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from rest_framework.permissions import BasePermission, IsAuthenticated, IsAdminUser, IsAuthenticatedOrReadOnly
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
@@ -30,6 +36,38 @@ class IsAdminOrManager(HasGroupPermission):
     allowed_groups = ["admin", "manager"]
 
 
+# ETags for the list endpoints, built from cheap aggregates over the listed
+# rows so unchanged lists can be answered with 304 Not Modified. The
+# paginated endpoints have none: the aggregate would cover every visible
+# row rather than the page being returned
+def _list_etag(request, *parts):
+    # The negotiated media type keeps browsable API and JSON responses apart
+    raw = '|'.join(str(part) for part in (
+        request.user.id, request.accepted_media_type, request.META.get('QUERY_STRING', ''), *parts,
+    ))
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+def _teams_etag(request):
+    teams = Team.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    # Membership rows are only inserted or deleted, so their count and
+    # highest id change whenever any team's member_count does
+    members = Team.members.through.objects.aggregate(count=Count('id'), latest=Max('id'))
+    return _list_etag(request, *teams.values(), *members.values())
+
+def _comments_etag(request, task_id):
+    # None unless the user is a member of the task's team, so non-members (and
+    # users who have since left the team) never get or match an ETag
+    stats = (
+        Task.objects.filter(id=task_id, project__team__members=request.user)
+        .annotate(count=Count('comments'), latest=Max('comments__updated_at'))
+        .values_list('count', 'latest')
+        .first()
+    )
+    if stats is None:
+        return None
+    return _list_etag(request, task_id, *stats)
+
+
 
 # Create your views here.
 @api_view(['GET'])
@@ -80,8 +118,9 @@ def index(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminOrManager])
 def create_team(request):
-    name = request.data.get('name')
-    description = request.data.get('description')
+    data = request.data
+    name = data.get('name')
+    description = data.get('description')
     
     if not name:
         return Response({"detail": "Team name is required."}, status=status.HTTP_400_BAD_REQUEST)
@@ -119,19 +158,12 @@ def create_team(request):
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=_teams_etag)
 def list_teams(request):
-    teams = Team.objects.all()
-    team_data = []
-    for team in teams:
-        team_data.append({
-            "id": team.id,
-            "name": team.name,
-            "description": team.description,
-            "member_count": team.members.count(),
-            "created_at": team.created_at,
-            "updated_at": team.updated_at,
-        })
-    return Response(team_data)
+    teams = Team.objects.annotate(member_count=Count('members')).values(
+        'id', 'name', 'description', 'member_count', 'created_at', 'updated_at',
+    )
+    return Response(list(teams))
 
 
 # Project views
@@ -171,18 +203,19 @@ def list_teams(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminOrManager])
 def create_project(request):
-    name = request.data.get('name')
-    description = request.data.get('description')
-    team_id = request.data.get('team_id')
+    data = request.data
+    name = data.get('name')
+    description = data.get('description')
+    team_id = data.get('team_id')
     
     if not all([name, team_id]):
         return Response({"detail": "Project name and team_id are required."}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
-    team = get_object_or_404(Team, id=team_id)
+    team = get_object_or_404(Team.objects.only('id'), id=team_id)
     
     # Check if user is member of the team
-    if not team.members.filter(id=request.user.id).exists():
+    if not Team.members.through.objects.filter(team_id=team.id, user_id=request.user.id).exists():
         return Response({"detail": "You must be a member of the team to create projects."}, 
                        status=status.HTTP_403_FORBIDDEN)
     
@@ -191,7 +224,7 @@ def create_project(request):
         "id": project.id,
         "name": project.name,
         "description": project.description,
-        "team_id": project.team.id,
+        "team_id": project.team_id,
         "created_at": project.created_at,
         "updated_at": project.updated_at,
     }, status=status.HTTP_201_CREATED)
@@ -199,20 +232,27 @@ def create_project(request):
 @extend_schema(
     tags=['projects'],
     summary="List user's projects",
-    description="Retrieve a list of projects from teams the user is a member of.",
+    description="Retrieve a paginated list of projects from teams the user is a member of, newest first.",
     responses={
         200: {
             'description': 'List of projects retrieved successfully',
-            'type': 'array',
-            'items': {
-                'type': 'object',
-                'properties': {
-                    'id': {'type': 'integer'},
-                    'name': {'type': 'string'},
-                    'description': {'type': 'string'},
-                    'team_name': {'type': 'string'},
-                    'created_at': {'type': 'string', 'format': 'date-time'},
-                    'updated_at': {'type': 'string', 'format': 'date-time'}
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'id': {'type': 'integer'},
+                            'name': {'type': 'string'},
+                            'description': {'type': 'string'},
+                            'team_name': {'type': 'string'},
+                            'created_at': {'type': 'string', 'format': 'date-time'},
+                            'updated_at': {'type': 'string', 'format': 'date-time'}
+                        }
+                    }
                 }
             }
         }
@@ -222,20 +262,13 @@ def create_project(request):
 @permission_classes([IsAuthenticated])
 def list_projects(request):
     # Show projects from teams the user is a member of
-    user_teams = request.user.teams.all()
-    projects = Project.objects.filter(team__in=user_teams)
-    
-    project_data = []
-    for project in projects:
-        project_data.append({
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "team_name": project.team.name,
-            "created_at": project.created_at,
-            "updated_at": project.updated_at,
-        })
-    return Response(project_data)
+    projects = (
+        Project.objects.filter(team__members=request.user)
+        .values('id', 'name', 'description', 'created_at', 'updated_at', team_name=F('team__name'))
+    )
+    paginator = NewestFirstCursorPagination()
+    page = paginator.paginate_queryset(projects, request)
+    return paginator.get_paginated_response(page)
 
 # Task views
 @extend_schema(
@@ -283,28 +316,41 @@ def list_projects(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminOrManager])
 def create_task(request):
-    title = request.data.get('title')
-    description = request.data.get('description')
-    project_id = request.data.get('project_id')
-    status_task = request.data.get('status', 'pending')
-    assignee_id = request.data.get('assignee_id')
+    data = request.data
+    title = data.get('title')
+    description = data.get('description')
+    project_id = data.get('project_id')
+    status_task = data.get('status', 'pending')
+    assignee_id = data.get('assignee_id')
     
     if not all([title, project_id]):
         return Response({"detail": "Task title and project_id are required."}, 
                        status=status.HTTP_400_BAD_REQUEST)
     
-    project = get_object_or_404(Project, id=project_id)
+    if assignee_id:
+        try:
+            assignee_id = int(assignee_id)
+        except (TypeError, ValueError):
+            return Response({"detail": "assignee_id must be an integer."},
+                           status=status.HTTP_400_BAD_REQUEST)
+
+    project = get_object_or_404(Project.objects.only('id', 'team_id'), id=project_id)
+
+    # Fetch team membership for both the user and the assignee in one query
+    member_ids = set(Team.members.through.objects.filter(
+        team_id=project.team_id, user_id__in=[request.user.id, assignee_id or request.user.id]
+    ).values_list('user_id', flat=True))
     
     # Check if user is member of the project's team
-    if not project.team.members.filter(id=request.user.id).exists():
+    if request.user.id not in member_ids:
         return Response({"detail": "You must be a member of the team to create tasks."}, 
                        status=status.HTTP_403_FORBIDDEN)
     
     # If assignee_id is provided, verify they are also a team member
     assignee = None
     if assignee_id:
-        assignee = get_object_or_404(User, id=assignee_id)
-        if not project.team.members.filter(id=assignee.id).exists():
+        assignee = get_object_or_404(User.objects.only('id', 'username'), id=assignee_id)
+        if assignee.id not in member_ids:
             return Response({"detail": "Assignee must be a member of the team."}, 
                            status=status.HTTP_400_BAD_REQUEST)
     else:
@@ -323,8 +369,8 @@ def create_task(request):
         "title": task.title,
         "description": task.description,
         "status": task.status,
-        "project_id": task.project.id,
-        "assignee_id": task.assignee.id,
+        "project_id": task.project_id,
+        "assignee_id": task.assignee_id,
         "assignee_username": task.assignee.username,
         "created_at": task.created_at,
         "updated_at": task.updated_at,
@@ -333,20 +379,27 @@ def create_task(request):
 @extend_schema(
     tags=['tasks'],
     summary="List user's tasks",
-    description="Retrieve a list of tasks from projects in teams the user is a member of.",
+    description="Retrieve a paginated list of tasks from projects in teams the user is a member of, newest first.",
     responses={
         200: {
             'description': 'List of tasks retrieved successfully',
-            'type': 'array',
-            'items': {
-                'type': 'object',
-                'properties': {
-                    'id': {'type': 'integer'},
-                    'title': {'type': 'string'},
-                    'status': {'type': 'string'},
-                    'project_name': {'type': 'string'},
-                    'assignee_username': {'type': 'string'},
-                    'created_at': {'type': 'string', 'format': 'date-time'}
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'id': {'type': 'integer'},
+                            'title': {'type': 'string'},
+                            'status': {'type': 'string'},
+                            'project_name': {'type': 'string'},
+                            'assignee_username': {'type': 'string'},
+                            'created_at': {'type': 'string', 'format': 'date-time'}
+                        }
+                    }
                 }
             }
         }
@@ -356,48 +409,51 @@ def create_task(request):
 @permission_classes([IsAuthenticated])
 def list_tasks(request):
     # Show tasks from projects in teams the user is a member of
-    user_teams = request.user.teams.all()
-    tasks = Task.objects.filter(project__team__in=user_teams)
-    
-    task_data = []
-    for task in tasks:
-        task_data.append({
-            "id": task.id,
-            "title": task.title,
-            "status": task.status,
-            "project_name": task.project.name,
-            "assignee_username": task.assignee.username,
-            "created_at": task.created_at,
-        })
-    return Response(task_data)
+    tasks = (
+        Task.objects.filter(project__team__members=request.user)
+        .values(
+            'id', 'title', 'status', 'created_at',
+            project_name=F('project__name'), assignee_username=F('assignee__username'),
+        )
+    )
+    paginator = NewestFirstCursorPagination()
+    page = paginator.paginate_queryset(tasks, request)
+    return paginator.get_paginated_response(page)
 
 # Comment views
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_comment(request):
-    content = request.data.get('content')
-    task_id = request.data.get('task_id')
+    data = request.data
+    content = data.get('content')
+    task_id = data.get('task_id')
     
     if not all([content, task_id]):
         return Response({"detail": "Comment content and task_id are required."}, 
                        status=status.HTTP_400_BAD_REQUEST)
-    
-    task = get_object_or_404(Task, id=task_id)
-    
-    # Check if user is member of the task's project's team
-    if not task.project.team.members.filter(id=request.user.id).exists():
+
+    try:
+        task_id = int(task_id)
+    except (TypeError, ValueError):
+        return Response({"detail": "task_id must be an integer."},
+                       status=status.HTTP_400_BAD_REQUEST)
+
+    # Check if user is member of the task's project's team; only when that
+    # fails is it worth a second query to tell a missing task apart
+    if not Team.objects.user_is_member_of_task(request.user.id, task_id):
+        get_object_or_404(Task.objects.only('id'), id=task_id)
         return Response({"detail": "You must be a member of the team to add comments."}, 
                        status=status.HTTP_403_FORBIDDEN)
     
     comment = Comment.objects.create(
-        task=task,
+        task_id=task_id,
         content=content
     )
     
     return Response({
         "id": comment.id,
         "content": comment.content,
-        "task_id": comment.task.id,
+        "task_id": comment.task_id,
         "created_at": comment.created_at,
         "updated_at": comment.updated_at,
     }, status=status.HTTP_201_CREATED)
@@ -405,20 +461,23 @@ def create_comment(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_comments(request, task_id):
-    task = get_object_or_404(Task, id=task_id)
-    
-    # Check if user is member of the task's project's team
-    if not task.project.team.members.filter(id=request.user.id).exists():
+    # The ETag query also checks that the user is a member of the task's
+    # project's team; only when that fails is it worth a second query to
+    # tell a missing task apart
+    etag = _comments_etag(request, task_id)
+    if etag is None:
+        get_object_or_404(Task.objects.only('id'), id=task_id)
         return Response({"detail": "You must be a member of the team to view comments."}, 
                        status=status.HTTP_403_FORBIDDEN)
+
+    etag = quote_etag(etag)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
     
-    comments = Comment.objects.filter(task=task)
-    comment_data = []
-    for comment in comments:
-        comment_data.append({
-            "id": comment.id,
-            "content": comment.content,
-            "created_at": comment.created_at,
-            "updated_at": comment.updated_at,
-        })
-    return Response(comment_data)
\ No newline at end of file
+    comments = (
+        Comment.objects.filter(task_id=task_id).order_by('created_at', 'id')
+        .values('id', 'content', 'created_at', 'updated_at')
+    )
+    return Response(list(comments), headers={'ETag': etag})
\ No newline at end of file